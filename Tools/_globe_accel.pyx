@@ -0,0 +1,232 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Compiled path expansion for svg_to_globe.py.
+
+Tokenizes an SVG path d attribute and expands it into cubic Béziers in a
+single pass, matching _tokenize_path + _expand_commands in svg_to_globe.py.
+Build in place with:
+
+    cythonize -i _globe_accel.pyx
+
+svg_to_globe.py falls back to its own implementation when this module has
+not been built.
+"""
+
+import numpy as np
+
+from cpython.conversion cimport PyOS_string_to_double
+
+cdef class _Expander:
+    """Growable curve buffer plus the pen state of one path."""
+    cdef double[:, :, ::1] curves
+    cdef unsigned char[::1] is_line
+    cdef Py_ssize_t n
+    cdef double cur_x, cur_y, start_x, start_y
+    cdef double close_tolerance_sq
+    cdef bint in_segment, is_closed
+    cdef Py_ssize_t seg_start
+    cdef list bounds, closed
+
+    def __cinit__(self, double close_tolerance):
+        self.curves = np.empty((64, 4, 2))
+        self.is_line = np.zeros(64, dtype=np.uint8)
+        self.n = 0
+        self.cur_x = self.cur_y = self.start_x = self.start_y = 0.0
+        self.close_tolerance_sq = close_tolerance * close_tolerance
+        self.in_segment = False
+        self.is_closed = False
+        self.seg_start = 0
+        self.bounds = []
+        self.closed = []
+
+    cdef void _reserve(self):
+        cdef double[:, :, ::1] grown
+        cdef unsigned char[::1] grown_mask
+        if self.n < self.curves.shape[0]:
+            return
+        grown = np.empty((2 * self.curves.shape[0], 4, 2))
+        grown[:self.n] = self.curves[:self.n]
+        self.curves = grown
+        grown_mask = np.zeros(2 * self.is_line.shape[0], dtype=np.uint8)
+        grown_mask[:self.n] = self.is_line[:self.n]
+        self.is_line = grown_mask
+
+    cdef void _begin_segment(self):
+        # Empty segments are dropped by reusing their slot
+        if self.in_segment and self.n > self.seg_start:
+            self.bounds.append(self.seg_start)
+            self.closed.append(self.is_closed)
+        self.seg_start = self.n
+        self.is_closed = False
+        self.in_segment = True
+        self.start_x = self.cur_x
+        self.start_y = self.cur_y
+
+    cdef void _line_to(self, double x3, double y3):
+        # Endpoints only; inner control points are filled by the caller
+        cdef Py_ssize_t n
+        self._reserve()
+        n = self.n
+        self.curves[n, 0, 0] = self.cur_x
+        self.curves[n, 0, 1] = self.cur_y
+        self.is_line[n] = 1
+        self.curves[n, 3, 0] = x3
+        self.curves[n, 3, 1] = y3
+        self.n += 1
+        self.cur_x = x3
+        self.cur_y = y3
+
+    cdef void _curve_to(self, double x1, double y1, double x2, double y2, double x3, double y3):
+        cdef Py_ssize_t n
+        self._reserve()
+        n = self.n
+        self.curves[n, 0, 0] = self.cur_x
+        self.curves[n, 0, 1] = self.cur_y
+        self.is_line[n] = 0
+        self.curves[n, 1, 0] = x1
+        self.curves[n, 1, 1] = y1
+        self.curves[n, 2, 0] = x2
+        self.curves[n, 2, 1] = y2
+        self.curves[n, 3, 0] = x3
+        self.curves[n, 3, 1] = y3
+        self.n += 1
+        self.cur_x = x3
+        self.cur_y = y3
+
+    cdef void run(self, Py_UCS4 cmd, double[::1] v, Py_ssize_t count):
+        cdef Py_ssize_t i
+        cdef double bx, by, dx, dy
+
+        if cmd == u'M' or cmd == u'm':
+            if count < 2:
+                return
+            if cmd == u'M':
+                self.cur_x = v[0]
+                self.cur_y = v[1]
+            else:
+                self.cur_x += v[0]
+                self.cur_y += v[1]
+            self._begin_segment()
+            if cmd == u'M':
+                # Additional coordinate pairs are implicit line-to
+                for i in range(2, count - 1, 2):
+                    self._line_to(v[i], v[i + 1])
+
+        elif cmd == u'C' or cmd == u'c':
+            if not self.in_segment:
+                self._begin_segment()
+            for i in range(0, count - 5, 6):
+                bx = 0.0 if cmd == u'C' else self.cur_x
+                by = 0.0 if cmd == u'C' else self.cur_y
+                self._curve_to(bx + v[i], by + v[i + 1], bx + v[i + 2], by + v[i + 3],
+                               bx + v[i + 4], by + v[i + 5])
+
+        elif cmd == u'L' or cmd == u'l':
+            if not self.in_segment:
+                self._begin_segment()
+            for i in range(0, count - 1, 2):
+                if cmd == u'L':
+                    self._line_to(v[i], v[i + 1])
+                else:
+                    self._line_to(self.cur_x + v[i], self.cur_y + v[i + 1])
+
+        elif cmd == u'Z' or cmd == u'z':
+            if self.in_segment:
+                dx = self.start_x - self.cur_x
+                dy = self.start_y - self.cur_y
+                if dx * dx + dy * dy > self.close_tolerance_sq:
+                    self._line_to(self.start_x, self.start_y)
+                self.is_closed = True
+                # Per the SVG spec the pen returns to the subpath start
+                self.cur_x = self.start_x
+                self.cur_y = self.start_y
+
+    cdef tuple finish(self):
+        if self.in_segment and self.n > self.seg_start:
+            self.bounds.append(self.seg_start)
+            self.closed.append(self.is_closed)
+        self.bounds.append(self.n)
+        return (
+            np.asarray(self.curves[:self.n]),
+            np.asarray(self.is_line[:self.n]).view(np.bool_),
+            np.array(self.bounds, dtype=np.int32),
+            np.array(self.closed, dtype=np.bool_),
+        )
+
+
+cdef inline bint _is_digit(Py_UCS4 ch):
+    return u'0' <= ch <= u'9'
+
+
+cdef double _parse_number(str d, Py_ssize_t i, Py_ssize_t j) except? -1.0:
+    # PyOS_string_to_double, like float(), ignores LC_NUMERIC; strtod does not
+    cdef char buf[64]
+    cdef Py_ssize_t k
+    if j - i >= 64:
+        return float(d[i:j])
+    for k in range(j - i):
+        buf[k] = <char>d[i + k]
+    buf[j - i] = 0
+    return PyOS_string_to_double(buf, NULL, NULL)
+
+
+cpdef tuple expand_path(str d, double close_tolerance):
+    """Expand path data into (curves, is_line, bounds, closed) in SVG space.
+
+    Same contract as svg_to_globe._expand_commands: (N, 4, 2) curves, a
+    mask of straight lines with only their endpoints set, n_segments + 1
+    segment boundaries and a per-segment closed flag.
+    """
+    cdef _Expander expander = _Expander(close_tolerance)
+    cdef double[::1] nums = np.empty(64)
+    cdef double[::1] grown
+    cdef Py_ssize_t count = 0
+    cdef Py_ssize_t i = 0, j, k, digits
+    cdef Py_ssize_t n = len(d)
+    cdef Py_UCS4 ch
+    cdef Py_UCS4 cmd = 0
+
+    while i < n:
+        ch = d[i]
+        if ch in u'MmCcLlHhVvZzSsQqTtAa':
+            if cmd:
+                expander.run(cmd, nums, count)
+            cmd = ch
+            count = 0
+            i += 1
+        elif ch == u'+' or ch == u'-' or ch == u'.' or _is_digit(ch):
+            j = i + 1 if (ch == u'+' or ch == u'-') else i
+            k = j
+            while j < n and _is_digit(d[j]):
+                j += 1
+            digits = j - k
+            if j < n and d[j] == u'.':
+                j += 1
+                k = j
+                while j < n and _is_digit(d[j]):
+                    j += 1
+                digits += j - k
+            if digits and j < n and (d[j] == u'e' or d[j] == u'E'):
+                k = j + 1
+                if k < n and (d[k] == u'+' or d[k] == u'-'):
+                    k += 1
+                if k < n and _is_digit(d[k]):
+                    j = k
+                    while j < n and _is_digit(d[j]):
+                        j += 1
+            # A lone sign or dot is not a number
+            if digits and cmd:
+                if count == nums.shape[0]:
+                    grown = np.empty(2 * count)
+                    grown[:count] = nums
+                    nums = grown
+                nums[count] = _parse_number(d, i, j)
+                count += 1
+            i = j
+        else:
+            # Whitespace, commas and anything unrecognised separate tokens
+            i += 1
+
+    if cmd:
+        expander.run(cmd, nums, count)
+    return expander.finish()
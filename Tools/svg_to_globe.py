@@ -9,15 +9,44 @@ Usage:
     python svg_to_globe.py --inner InnerWorld.svg --outer OuterWorld.svg -o world.globe
 """
 
-import re
+from __future__ import annotations
+
 import json
-import math
+import os
 import argparse
+import functools
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Tuple, Dict, Any, Optional
+from typing import Iterator, List, Tuple, Dict, Any, Optional
 import xml.etree.ElementTree as ET
-from uuid import uuid4
+from uuid import UUID, uuid4
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional; without it paths are expanded in pure Python
+    np = None
+
+try:
+    # Optional compiled tokenizer/expander, see _globe_accel.pyx
+    import _globe_accel
+except ImportError:
+    _globe_accel = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from lxml import etree
+    XML_PARSE_ERRORS = (etree.XMLSyntaxError, ET.ParseError)
+except ImportError:
+    etree = None
+    XML_PARSE_ERRORS = (ET.ParseError,)
 
 # Default output to iCloud Drive for automatic iPad sync
 ICLOUD_DRIVE = Path.home() / "Library/Mobile Documents/com~apple~CloudDocs"
@@ -31,6 +60,81 @@ LAT_RANGE = 72.0
 INNER_SHIFT = -69.5
 OUTER_SHIFT = 2015.5
 
+SVG_NS = 'http://www.w3.org/2000/svg'
+
+# Bytes of the SVG read and handed to the XML parser per feed() call
+READ_CHUNK_SIZE = 1 << 20
+
+# SVG -> geographic as one multiply-add per axis:
+#   lon = x * LON_SCALE + (shift - SVG_WIDTH / 2) * LON_SCALE
+#   lat = y * LAT_SCALE + LAT_OFFSET
+LON_SCALE = LON_RANGE / (SVG_WIDTH / 2)
+LAT_SCALE = -LAT_RANGE / (SVG_HEIGHT / 2)
+LAT_OFFSET = -LAT_SCALE * SVG_HEIGHT / 2
+
+# Straight lines become cubics with control points at 1/3 and 2/3, written
+# as convex combinations so p0 ~= p3 cannot cancel catastrophically
+ONE_THIRD = 1.0 / 3.0
+TWO_THIRDS = 2.0 / 3.0
+
+# Bernstein degree elevation of a line to a cubic: rows are the weights
+# of [p0, p3] for each control point, so curve = BERN_LINE @ [p0, p3]
+BERN_LINE = (
+    (1.0, 0.0),
+    (TWO_THIRDS, ONE_THIRD),
+    (ONE_THIRD, TWO_THIRDS),
+    (0.0, 1.0),
+)
+
+# Output coordinates are rounded to 1 / COORD_SCALE degrees (~11 m)
+COORD_SCALE = 1e4
+
+# Minimum gap (SVG units, ~0.01°) before Z emits an explicit closing curve
+CLOSE_TOLERANCE = 0.01 / LON_SCALE
+
+# Style shared by every converted path. One dict is referenced by all of
+# them, so never mutate it in place.
+COASTLINE_STYLE = {
+    "strokeColor": {"r": 0.9, "g": 0.9, "b": 0.9, "a": 1.0},
+    "strokeWidth": 1.5
+}
+
+# Inputs with more SVG paths than this are converted in a process pool
+PARALLEL_MIN_PATHS = 64
+
+
+def _iter_elements(filepath: str, tag: str):
+    """Stream elements matching tag ('{*}name' matches any namespace).
+
+    The file is fed to a pull parser in chunks, so neither a full copy of
+    the file nor the whole tree is held at once.
+    """
+    if etree is not None:
+        # huge_tree lifts libxml2's 10 MB text limit, which a single
+        # detailed coastline d attribute can exceed
+        parser = etree.XMLPullParser(events=('end',), tag=tag, huge_tree=True)
+
+        def matches(elem):
+            return True
+    else:
+        parser = ET.XMLPullParser(events=('end',))
+        any_ns = tag.startswith('{*}')
+        name = tag[3:] if any_ns else tag
+
+        def matches(elem):
+            return elem.tag == name or (any_ns and elem.tag.endswith('}' + name))
+
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+            parser.feed(chunk)
+            for _, elem in parser.read_events():
+                if matches(elem):
+                    yield elem
+    parser.close()
+    for _, elem in parser.read_events():
+        if matches(elem):
+            yield elem
+
 
 def parse_svg_file(filepath: str) -> List[str]:
     """Parse SVG file and extract path d attributes."""
@@ -39,220 +143,493 @@ def parse_svg_file(filepath: str) -> List[str]:
         return []
     
     try:
-        tree = ET.parse(filepath)
-        root = tree.getroot()
-        
-        namespaces = {'svg': 'http://www.w3.org/2000/svg'}
         paths = []
-        
-        for path in root.findall('.//svg:path', namespaces):
-            d = path.get('d')
-            if d:
-                paths.append(d)
-        
-        if not paths:
-            for path in root.iter():
-                if path.tag.endswith('path') or path.tag == 'path':
-                    d = path.get('d')
-                    if d:
-                        paths.append(d)
+        for tag in (f'{{{SVG_NS}}}path', '{*}path'):
+            for elem in _iter_elements(filepath, tag):
+                d = elem.get('d')
+                if d:
+                    paths.append(d)
+                elem.clear()
+            # Only rescan without the namespace if the SVG one found nothing
+            if paths:
+                break
         
         return paths
-    except ET.ParseError as e:
+    except XML_PARSE_ERRORS as e:
         print(f"  Error parsing {filepath}: {e}")
         return []
 
 
-def parse_path_commands(d: str) -> List[Tuple[str, List[float]]]:
-    """Parse SVG path d attribute into commands."""
-    commands = []
-    pattern = r'([MCmcLlHhVvZzSsQqTtAa])([^MCmcLlHhVvZzSsQqTtAa]*)'
+PATH_COMMANDS = frozenset('MmCcLlHhVvZzSsQqTtAa')
+
+
+def _tokenize_path(d: str) -> Tuple[List[str], List[int], List[str]]:
+    """Split path data into command letters, per-command number counts and
+    the number tokens themselves, left as strings for bulk conversion.
+
+    Single pass over the string. Numbers may use exponents and need no
+    separator when unambiguous, e.g. "0-2" or ".5.5".
+    """
+    cmds: List[str] = []
+    counts: List[int] = []
+    numbers: List[str] = []
+    i = 0
+    n = len(d)
     
-    for match in re.finditer(pattern, d):
-        cmd = match.group(1)
-        coords_str = match.group(2).strip()
-        
-        if coords_str:
-            numbers = re.findall(r'-?\d+\.?\d*', coords_str)
-            coords = [float(n) for n in numbers]
+    while i < n:
+        ch = d[i]
+        if ch in PATH_COMMANDS:
+            cmds.append(ch)
+            counts.append(0)
+            i += 1
+        elif ch in '+-.0123456789':
+            j = i + 1 if ch in '+-' else i
+            k = j
+            while j < n and '0' <= d[j] <= '9':
+                j += 1
+            digits = j - k
+            if j < n and d[j] == '.':
+                j += 1
+                k = j
+                while j < n and '0' <= d[j] <= '9':
+                    j += 1
+                digits += j - k
+            if digits and j < n and d[j] in 'eE':
+                k = j + 1
+                if k < n and d[k] in '+-':
+                    k += 1
+                if k < n and '0' <= d[k] <= '9':
+                    j = k
+                    while j < n and '0' <= d[j] <= '9':
+                        j += 1
+            # A lone sign or dot is not a number
+            if digits and counts:
+                numbers.append(d[i:j])
+                counts[-1] += 1
+            i = j
         else:
-            coords = []
-        
-        commands.append((cmd, coords))
+            # Whitespace, commas and anything unrecognised separate tokens
+            i += 1
     
+    return cmds, counts, numbers
+
+
+def parse_path_commands(d: str) -> List[Tuple[str, List[float]]]:
+    """Parse SVG path d attribute into commands."""
+    cmds, counts, numbers = _tokenize_path(d)
+    commands = []
+    pos = 0
+    for cmd, count in zip(cmds, counts):
+        commands.append((cmd, list(map(float, numbers[pos:pos + count]))))
+        pos += count
     return commands
 
 
-def svg_to_geographic(x: float, y: float) -> Tuple[float, float]:
-    """Convert unified SVG coordinates to geographic [lat, lon]."""
-    lon = (x - SVG_WIDTH / 2) * (LON_RANGE / (SVG_WIDTH / 2))
-    lat = -(y - SVG_HEIGHT / 2) * (LAT_RANGE / (SVG_HEIGHT / 2))
-    lat = max(-LAT_RANGE, min(LAT_RANGE, lat))
-    return (round(lat, 4), round(lon, 4))
+@functools.lru_cache(maxsize=None)
+def _geo_transform(shift: float) -> np.ndarray:
+    """3x2 affine matrix taking homogeneous SVG rows [x, y, 1] to [lat, lon]."""
+    return np.array([
+        [0.0, LON_SCALE],
+        [LAT_SCALE, 0.0],
+        [LAT_OFFSET, (shift - SVG_WIDTH / 2) * LON_SCALE],
+    ])
 
 
-def point_to_coord(x: float, y: float, shift: float) -> List[float]:
-    """Convert SVG point to [lat, lon] compact coordinate."""
-    lat, lon = svg_to_geographic(x + shift, y)
-    return [lat, lon]
+def svg_to_geographic_batch(xy: np.ndarray, shift: float) -> np.ndarray:
+    """Convert an (N, 2) array of SVG points to an (N, 2) array of [lat, lon]."""
+    pts = np.empty((len(xy), 3))
+    pts[:, :2] = xy
+    pts[:, 2] = 1.0
+    geo = pts @ _geo_transform(shift)
+    np.clip(geo[:, 0], -LAT_RANGE, LAT_RANGE, out=geo[:, 0])
+    return geo
 
 
+@dataclass
 class PathSegment:
-    """Represents a continuous path segment."""
-    def __init__(self):
-        self.cubic_segments: List[List[List[float]]] = []
-        self.is_closed: bool = False
-        self.start_point: Optional[List[float]] = None
-        self.current_point: Optional[List[float]] = None
+    """A continuous path segment stored as one contiguous curve array.
 
+    Without NumPy the same fields hold nested lists.
+    """
+    curves: np.ndarray  # (N, 4, 2) float64, [lat, lon] control points
+    is_closed: bool
+
+
+# Command codes understood by _expand_commands
+CMD_CODES = {'M': 0, 'm': 1, 'C': 2, 'c': 3, 'L': 4, 'l': 5, 'Z': 6, 'z': 6}
+
+
+def _line_to_cubic(curves, is_line, n, x0, y0, x3, y3):
+    """Write the endpoints of line (x0, y0) -> (x3, y3) into curves[n].
+
+    The inner control points are filled later by _elevate_lines.
+    """
+    curves[n, 0, 0] = x0
+    curves[n, 0, 1] = y0
+    curves[n, 3, 0] = x3
+    curves[n, 3, 1] = y3
+    is_line[n] = True
+
+
+def _expand_commands(cmd_codes, coord_offsets, coords, max_curves, close_tolerance):
+    """Expand encoded path commands into cubic Béziers in SVG space.
+
+    Command k owns coords[coord_offsets[k]:coord_offsets[k + 1]], and
+    max_curves sizes the output buffer (see _count_cubics). Returns
+    the (N, 4, 2) curves, a mask of curves that are straight lines (only
+    their endpoints are set), segment boundaries into the curves
+    (n_segments + 1 entries) and a per-segment closed flag.
+    """
+    n_cmds = len(cmd_codes)
+    curves = np.empty((max_curves, 4, 2))
+    is_line = np.zeros(max_curves, dtype=np.bool_)
+    bounds = np.zeros(n_cmds + 2, dtype=np.int32)
+    closed = np.zeros(n_cmds + 1, dtype=np.bool_)
+    n = 0
+    n_segs = 0
+    in_segment = False
+    cur_x = 0.0
+    cur_y = 0.0
+    start_x = 0.0
+    start_y = 0.0
+
+    for k in range(n_cmds):
+        code = cmd_codes[k]
+        lo = coord_offsets[k]
+        hi = coord_offsets[k + 1]
+
+        if code == 0 or code == 1:  # M, m
+            if hi - lo < 2:
+                continue
+            if code == 0:
+                cur_x = coords[lo]
+                cur_y = coords[lo + 1]
+            else:
+                cur_x += coords[lo]
+                cur_y += coords[lo + 1]
+            # Empty segments are dropped by reusing their slot
+            if in_segment and n > bounds[n_segs]:
+                n_segs += 1
+            bounds[n_segs] = n
+            closed[n_segs] = False
+            in_segment = True
+            start_x = cur_x
+            start_y = cur_y
+
+            if code == 0:
+                # Additional coordinate pairs are implicit line-to
+                for i in range(lo + 2, hi - 1, 2):
+                    x3 = coords[i]
+                    y3 = coords[i + 1]
+                    _line_to_cubic(curves, is_line, n, cur_x, cur_y, x3, y3)
+                    n += 1
+                    cur_x = x3
+                    cur_y = y3
+
+        elif code == 2 or code == 3:  # C, c
+            if not in_segment:
+                bounds[n_segs] = n
+                in_segment = True
+                start_x = cur_x
+                start_y = cur_y
+            for i in range(lo, hi - 5, 6):
+                base_x = 0.0 if code == 2 else cur_x
+                base_y = 0.0 if code == 2 else cur_y
+                curves[n, 0, 0] = cur_x
+                curves[n, 0, 1] = cur_y
+                for j in range(3):
+                    curves[n, j + 1, 0] = base_x + coords[i + 2 * j]
+                    curves[n, j + 1, 1] = base_y + coords[i + 2 * j + 1]
+                cur_x = curves[n, 3, 0]
+                cur_y = curves[n, 3, 1]
+                n += 1
+
+        elif code == 4 or code == 5:  # L, l
+            if not in_segment:
+                bounds[n_segs] = n
+                in_segment = True
+                start_x = cur_x
+                start_y = cur_y
+            for i in range(lo, hi - 1, 2):
+                if code == 4:
+                    x3 = coords[i]
+                    y3 = coords[i + 1]
+                else:
+                    x3 = cur_x + coords[i]
+                    y3 = cur_y + coords[i + 1]
+                _line_to_cubic(curves, is_line, n, cur_x, cur_y, x3, y3)
+                n += 1
+                cur_x = x3
+                cur_y = y3
+
+        elif code == 6:  # Z, z
+            if in_segment:
+                dx = start_x - cur_x
+                dy = start_y - cur_y
+                if dx * dx + dy * dy > close_tolerance * close_tolerance:
+                    _line_to_cubic(curves, is_line, n, cur_x, cur_y, start_x, start_y)
+                    n += 1
+                closed[n_segs] = True
+                # Per the SVG spec the pen returns to the subpath start
+                cur_x = start_x
+                cur_y = start_y
+
+    if in_segment and n > bounds[n_segs]:
+        n_segs += 1
+    bounds[n_segs] = n
+    return curves[:n], is_line[:n], bounds[:n_segs + 1], closed[:n_segs]
+
+
+_expand_kernel = None
+
+
+def _get_expand_kernel():
+    """Return _expand_commands, JIT-compiled with Numba when available.
+
+    Numba is imported on first use only, so runs served by _globe_accel or
+    the pure-Python path never pay its import cost.
+    """
+    global _expand_kernel, _line_to_cubic
+    if _expand_kernel is None:
+        try:
+            from numba import njit
+        except ImportError:
+            # Numba is optional; without it the kernel runs as plain Python
+            _expand_kernel = _expand_commands
+        else:
+            _line_to_cubic = njit(cache=True)(_line_to_cubic)
+            _expand_kernel = njit(cache=True)(_expand_commands)
+    return _expand_kernel
+
+
+def _count_cubics(cmds: List[str], counts: List[int]) -> int:
+    """Count the cubics a tokenized command list can produce.
+
+    Exact except for Z/z, which is counted even if the subpath is already
+    closed and no closing curve is emitted.
+    """
+    total = 0
+    for cmd, count in zip(cmds, counts):
+        if cmd in ('C', 'c'):
+            total += count // 6
+        elif cmd in ('L', 'l'):
+            total += count // 2
+        elif cmd == 'M':
+            total += max(0, count // 2 - 1)
+        elif cmd in ('Z', 'z'):
+            total += 1
+    return total
+
+
+def _expand_commands_py(commands: List[Tuple[str, List[float]]], shift: float) -> List[PathSegment]:
+    """Pure-Python counterpart of _expand_commands, used without NumPy.
+
+    Returns segments of unrounded [lat, lon] lists; see round_coords.
+
+    Points are complex numbers (x + yj) so relative offsets run as native
+    complex arithmetic, and each point is projected once, when emitted.
+    Lines are interpolated between their projected end points.
+    """
+    lon_offset = (shift - SVG_WIDTH / 2) * LON_SCALE
+
+    def project(p: complex) -> List[float]:
+        lat = min(LAT_RANGE, max(-LAT_RANGE, p.imag * LAT_SCALE + LAT_OFFSET))
+        return [lat, p.real * LON_SCALE + lon_offset]
+
+    def lerp(a: List[float], b: List[float], wa: float, wb: float) -> List[float]:
+        return [wa * a[0] + wb * b[0], wa * a[1] + wb * b[1]]
+
+    def line_to_cubic(p0_geo: List[float], p3_geo: List[float]) -> List[List[float]]:
+        # Interpolate between projected end points so the line stays
+        # straight even when an end point was latitude-clamped
+        return [p0_geo, lerp(p0_geo, p3_geo, *BERN_LINE[1]),
+                lerp(p0_geo, p3_geo, *BERN_LINE[2]), p3_geo]
 
-def extract_path_segments(path_data: str, shift: float) -> List[Dict[str, Any]]:
-    """Extract path segments preserving Bézier curves."""
-    commands = parse_path_commands(path_data)
     segments: List[PathSegment] = []
-    current_segment: Optional[PathSegment] = None
-    current_pos = (0.0, 0.0)
-    
+    curves: Optional[List[List[List[float]]]] = None
+    is_closed = False
+    cur = start = 0j
+    cur_geo = project(cur)
+
     for cmd, coords in commands:
-        if cmd == 'M':
-            if len(coords) >= 2:
-                if current_segment and len(current_segment.cubic_segments) > 0:
-                    segments.append(current_segment)
-                
-                current_segment = PathSegment()
-                current_pos = (coords[0], coords[1])
-                current_segment.start_point = point_to_coord(current_pos[0], current_pos[1], shift)
-                current_segment.current_point = current_segment.start_point
-                
+        if cmd in ('M', 'm'):
+            if len(coords) < 2:
+                continue
+            if curves:
+                segments.append(PathSegment(curves, is_closed))
+            cur = complex(coords[0], coords[1]) + (cur if cmd == 'm' else 0)
+            cur_geo = project(cur)
+            start = cur
+            curves = []
+            is_closed = False
+
+            if cmd == 'M':
                 # Additional coordinate pairs are implicit line-to
                 for i in range(2, len(coords) - 1, 2):
-                    prev_pos = current_pos
-                    current_pos = (coords[i], coords[i + 1])
-                    p0 = point_to_coord(prev_pos[0], prev_pos[1], shift)
-                    p3 = point_to_coord(current_pos[0], current_pos[1], shift)
-                    p1 = [p0[0] + (p3[0] - p0[0]) / 3, p0[1] + (p3[1] - p0[1]) / 3]
-                    p2 = [p0[0] + (p3[0] - p0[0]) * 2 / 3, p0[1] + (p3[1] - p0[1]) * 2 / 3]
-                    current_segment.cubic_segments.append([p0, p1, p2, p3])
-                    current_segment.current_point = p3
-                    
-        elif cmd == 'm':
-            if len(coords) >= 2:
-                if current_segment and len(current_segment.cubic_segments) > 0:
-                    segments.append(current_segment)
-                
-                current_segment = PathSegment()
-                current_pos = (current_pos[0] + coords[0], current_pos[1] + coords[1])
-                current_segment.start_point = point_to_coord(current_pos[0], current_pos[1], shift)
-                current_segment.current_point = current_segment.start_point
-                
-        elif cmd == 'C':
-            if current_segment is None:
-                current_segment = PathSegment()
-                current_segment.start_point = point_to_coord(current_pos[0], current_pos[1], shift)
-                current_segment.current_point = current_segment.start_point
-            
-            for i in range(0, len(coords) - 5, 6):
-                p0 = point_to_coord(current_pos[0], current_pos[1], shift)
-                p1 = point_to_coord(coords[i], coords[i + 1], shift)
-                p2 = point_to_coord(coords[i + 2], coords[i + 3], shift)
-                p3 = point_to_coord(coords[i + 4], coords[i + 5], shift)
-                
-                current_segment.cubic_segments.append([p0, p1, p2, p3])
-                current_pos = (coords[i + 4], coords[i + 5])
-                current_segment.current_point = p3
-                
-        elif cmd == 'c':
-            if current_segment is None:
-                current_segment = PathSegment()
-                current_segment.start_point = point_to_coord(current_pos[0], current_pos[1], shift)
-                current_segment.current_point = current_segment.start_point
-            
+                    p3 = complex(coords[i], coords[i + 1])
+                    p3_geo = project(p3)
+                    curves.append(line_to_cubic(cur_geo, p3_geo))
+                    cur, cur_geo = p3, p3_geo
+
+        elif cmd in ('C', 'c'):
+            if curves is None:
+                curves = []
+                start = cur
             for i in range(0, len(coords) - 5, 6):
-                p0 = point_to_coord(current_pos[0], current_pos[1], shift)
-                p1 = point_to_coord(current_pos[0] + coords[i], current_pos[1] + coords[i + 1], shift)
-                p2 = point_to_coord(current_pos[0] + coords[i + 2], current_pos[1] + coords[i + 3], shift)
-                p3 = point_to_coord(current_pos[0] + coords[i + 4], current_pos[1] + coords[i + 5], shift)
-                
-                current_segment.cubic_segments.append([p0, p1, p2, p3])
-                current_pos = (current_pos[0] + coords[i + 4], current_pos[1] + coords[i + 5])
-                current_segment.current_point = p3
-                
-        elif cmd == 'L':
-            if current_segment is None:
-                current_segment = PathSegment()
-                current_segment.start_point = point_to_coord(current_pos[0], current_pos[1], shift)
-                current_segment.current_point = current_segment.start_point
-            
+                base = 0 if cmd == 'C' else cur
+                p1 = base + complex(coords[i], coords[i + 1])
+                p2 = base + complex(coords[i + 2], coords[i + 3])
+                p3 = base + complex(coords[i + 4], coords[i + 5])
+                p3_geo = project(p3)
+                curves.append([cur_geo, project(p1), project(p2), p3_geo])
+                cur, cur_geo = p3, p3_geo
+
+        elif cmd in ('L', 'l'):
+            if curves is None:
+                curves = []
+                start = cur
             for i in range(0, len(coords) - 1, 2):
-                p0 = point_to_coord(current_pos[0], current_pos[1], shift)
-                current_pos = (coords[i], coords[i + 1])
-                p3 = point_to_coord(current_pos[0], current_pos[1], shift)
-                p1 = [p0[0] + (p3[0] - p0[0]) / 3, p0[1] + (p3[1] - p0[1]) / 3]
-                p2 = [p0[0] + (p3[0] - p0[0]) * 2 / 3, p0[1] + (p3[1] - p0[1]) * 2 / 3]
-                current_segment.cubic_segments.append([p0, p1, p2, p3])
-                current_segment.current_point = p3
-                
-        elif cmd == 'l':
-            if current_segment is None:
-                current_segment = PathSegment()
-                current_segment.start_point = point_to_coord(current_pos[0], current_pos[1], shift)
-                current_segment.current_point = current_segment.start_point
-            
-            for i in range(0, len(coords) - 1, 2):
-                p0 = point_to_coord(current_pos[0], current_pos[1], shift)
-                current_pos = (current_pos[0] + coords[i], current_pos[1] + coords[i + 1])
-                p3 = point_to_coord(current_pos[0], current_pos[1], shift)
-                p1 = [p0[0] + (p3[0] - p0[0]) / 3, p0[1] + (p3[1] - p0[1]) / 3]
-                p2 = [p0[0] + (p3[0] - p0[0]) * 2 / 3, p0[1] + (p3[1] - p0[1]) * 2 / 3]
-                current_segment.cubic_segments.append([p0, p1, p2, p3])
-                current_segment.current_point = p3
-                
+                p3 = complex(coords[i], coords[i + 1]) + (cur if cmd == 'l' else 0)
+                p3_geo = project(p3)
+                curves.append(line_to_cubic(cur_geo, p3_geo))
+                cur, cur_geo = p3, p3_geo
+
         elif cmd in ('Z', 'z'):
-            if current_segment and current_segment.start_point and current_segment.current_point:
-                start = current_segment.start_point
-                end = current_segment.current_point
-                dist = math.sqrt((start[0] - end[0])**2 + (start[1] - end[1])**2)
-                if dist > 0.01:
-                    p0 = end
-                    p3 = start
-                    p1 = [p0[0] + (p3[0] - p0[0]) / 3, p0[1] + (p3[1] - p0[1]) / 3]
-                    p2 = [p0[0] + (p3[0] - p0[0]) * 2 / 3, p0[1] + (p3[1] - p0[1]) * 2 / 3]
-                    current_segment.cubic_segments.append([p0, p1, p2, p3])
-                current_segment.is_closed = True
-    
-    if current_segment and len(current_segment.cubic_segments) > 0:
-        segments.append(current_segment)
-    
-    # Convert to output format
-    result = []
-    for seg in segments:
-        if len(seg.cubic_segments) > 0:
-            path_dict = {
-                "id": str(uuid4()),
-                "pathType": "cubic",
-                "cubicSegments": seg.cubic_segments,
-                "isClosed": seg.is_closed,
-                "style": {
-                    "strokeColor": {"r": 0.9, "g": 0.9, "b": 0.9, "a": 1.0},
-                    "strokeWidth": 1.5
-                }
-            }
-            result.append(path_dict)
-    
-    return result
+            if curves is not None:
+                gap = start - cur
+                start_geo = project(start)
+                if gap.real * gap.real + gap.imag * gap.imag > CLOSE_TOLERANCE * CLOSE_TOLERANCE:
+                    curves.append(line_to_cubic(cur_geo, start_geo))
+                is_closed = True
+                cur, cur_geo = start, start_geo
+
+    if curves:
+        segments.append(PathSegment(curves, is_closed))
+    return segments
+
+
+def _elevate_lines(curves: np.ndarray, is_line: np.ndarray) -> None:
+    """Fill in the inner control points of straight-line curves in place.
+
+    All lines are elevated at once as BERN_LINE @ [p0, p3].
+    """
+    ends = curves[is_line][:, ::3]
+    curves[is_line] = np.einsum('ij,njk->nik', BERN_LINE, ends)
+
+
+def extract_path_segments(path_data: str, shift: float) -> List[PathSegment]:
+    """Extract path segments preserving Bézier curves."""
+    if np is None:
+        return _expand_commands_py(parse_path_commands(path_data), shift)
+
+    if _globe_accel is not None:
+        curves, is_line, bounds, closed = _globe_accel.expand_path(path_data, CLOSE_TOLERANCE)
+    else:
+        # Unsupported commands get code -1 so their coordinates are skipped
+        cmds, counts, numbers = _tokenize_path(path_data)
+        coord_offsets = np.zeros(len(counts) + 1, dtype=np.int32)
+        np.cumsum(counts, out=coord_offsets[1:])
+        curves, is_line, bounds, closed = _get_expand_kernel()(
+            np.array([CMD_CODES.get(cmd, -1) for cmd in cmds], dtype=np.int8),
+            coord_offsets,
+            # One C-level conversion for every number in the path
+            np.array(numbers, dtype=np.float64),
+            _count_cubics(cmds, counts),
+            CLOSE_TOLERANCE,
+        )
+
+    # Project end points, plus the inner control points of true curves.
+    # Within a segment each curve starts where the previous one ended, so
+    # p0 is copied from the previous p3 and only projected at segment
+    # starts. Lines are elevated after projection so that they stay
+    # straight between their (latitude-clamped) end points.
+    geo = np.empty_like(curves)
+    geo[:, 3] = svg_to_geographic_batch(curves[:, 3], shift)
+    curved = ~is_line
+    geo[curved, 1:3] = svg_to_geographic_batch(
+        curves[curved, 1:3].reshape(-1, 2), shift
+    ).reshape(-1, 2, 2)
+    geo[1:, 0] = geo[:-1, 3]
+    starts = bounds[:-1]
+    geo[starts, 0] = svg_to_geographic_batch(curves[starts, 0], shift)
+    _elevate_lines(geo, is_line)
+
+    segments = []
+    for k in range(len(closed)):
+        seg_curves = geo[bounds[k]:bounds[k + 1]]
+        segments.append(PathSegment(curves=seg_curves, is_closed=bool(closed[k])))
+    return segments
+
+
+def round_coords(a: np.ndarray) -> np.ndarray:
+    """Round coordinates to fixed point as rint(a * COORD_SCALE) / COORD_SCALE.
+
+    Dividing, rather than multiplying by 1e-4, keeps every value at its
+    short 4-decimal repr in the JSON output. Without NumPy, a is the
+    nested curve list from _expand_commands_py.
+    """
+    if np is None:
+        return [[[round(v * COORD_SCALE) / COORD_SCALE for v in pt] for pt in curve]
+                for curve in a]
+    out = np.multiply(a, COORD_SCALE)
+    np.rint(out, out=out)
+    out /= COORD_SCALE
+    return out
+
+
+def uuid4_batch(n: int) -> List[str]:
+    """Generate n random UUID strings from a single os.urandom call."""
+    buf = os.urandom(16 * n)
+    return [str(UUID(bytes=buf[i:i + 16], version=4)) for i in range(0, 16 * n, 16)]
 
 
 def process_svg_to_paths(svg_paths: List[str], shift: float) -> List[Dict[str, Any]]:
-    """Process SVG paths to globe format paths."""
-    result_paths = []
-    
-    for path_data in svg_paths:
-        paths = extract_path_segments(path_data, shift)
-        result_paths.extend(paths)
+    """Process SVG paths to globe format paths.
+
+    Large inputs are split across worker processes; ids are still assigned
+    here, in the parent.
+    """
+    extract = functools.partial(extract_path_segments, shift=shift)
+    workers = os.cpu_count() or 1
+    # A single worker would only add process start-up and pickling costs
+    if workers > 1 and len(svg_paths) > PARALLEL_MIN_PATHS:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(svg_paths) // (workers * 4))
+            per_path = list(executor.map(extract, svg_paths, chunksize=chunksize))
+    else:
+        per_path = [extract(path_data) for path_data in svg_paths]
+
+    # Segment count is known up front, so fill a pre-sized list
+    n_segments = sum(map(len, per_path))
+    ids = uuid4_batch(n_segments)
+    result_paths: List[Optional[Dict[str, Any]]] = [None] * n_segments
+    for i, seg in enumerate(itertools.chain.from_iterable(per_path)):
+        result_paths[i] = {
+            "id": ids[i],
+            "pathType": "cubic",
+            # Round once here, at the output boundary
+            "cubicSegments": round_coords(seg.curves),
+            "isClosed": seg.is_closed,
+            "style": COASTLINE_STYLE
+        }
     
     return result_paths
 
 
+def _json_default(obj: Any) -> Any:
+    """Serialize NumPy arrays for the stdlib json fallback."""
+    if np is not None and isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dump_json(obj: Any) -> bytes:
+    """Serialize to compact JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, separators=(',', ':'), default=_json_default).encode()
+
+
 def generate_grid_layer(minor_interval: float = 15.0, major_interval: float = 30.0,
                         segments_per_line: int = 72) -> Dict[str, Any]:
     """Generate a grid layer with latitude and longitude lines.
@@ -332,65 +709,58 @@ def generate_grid_layer(minor_interval: float = 15.0, major_interval: float = 30
     }
 
 
-def create_globe_document(inner_svg: str = None, outer_svg: str = None, name: str = "Converted World",
-                          include_grid: bool = True) -> Dict[str, Any]:
-    """Create a .globe document from SVG files."""
-    all_paths = []
-    total_curves = 0
-    
-    if inner_svg:
-        print(f"Processing {inner_svg}...")
-        inner_paths = parse_svg_file(inner_svg)
-        print(f"  Found {len(inner_paths)} SVG paths")
-        converted = process_svg_to_paths(inner_paths, INNER_SHIFT)
-        curves = sum(len(p.get("cubicSegments", [])) for p in converted)
-        print(f"  Converted to {len(converted)} segments with {curves} Bézier curves")
-        all_paths.extend(converted)
-        total_curves += curves
-    
-    if outer_svg:
-        print(f"Processing {outer_svg}...")
-        outer_paths = parse_svg_file(outer_svg)
-        print(f"  Found {len(outer_paths)} SVG paths")
-        converted = process_svg_to_paths(outer_paths, OUTER_SHIFT)
-        curves = sum(len(p.get("cubicSegments", [])) for p in converted)
-        print(f"  Converted to {len(converted)} segments with {curves} Bézier curves")
-        all_paths.extend(converted)
-        total_curves += curves
-    
+def iter_globe_document(inner_svg: str = None, outer_svg: str = None, name: str = "Converted World",
+                        include_grid: bool = True) -> Iterator[bytes]:
+    """Convert SVG files to a .globe document, yielding its JSON in chunks.
+
+    Paths are serialized as each SVG file is converted, so the full
+    document is never held in memory.
+    """
     now = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-    
-    # Build layers list
-    layers = []
+    header = {
+        "formatVersion": "2.0",
+        "meta": {
+            "name": name,
+            "created": now,
+            "modified": now
+        }
+    }
+    yield dump_json(header)[:-1] + b',"layers":['
 
     # Grid layer first (renders behind coastlines)
     if include_grid:
         grid_layer = generate_grid_layer()
-        layers.append(grid_layer)
         print(f"Generated grid layer with {len(grid_layer['paths'])} lines")
+        yield dump_json(grid_layer) + b','
 
-    # Coastlines layer
-    layers.append({
+    # Coastlines layer, with its paths streamed in
+    coastlines = {
         "id": str(uuid4()),
         "name": "Coastlines",
         "isVisible": True,
-        "isLocked": False,
-        "paths": all_paths
-    })
-
-    document = {
-        "formatVersion": "2.0",
-        "meta": {
-            "name": name,
-            "created": now,
-            "modified": now
-        },
-        "layers": layers
+        "isLocked": False
     }
+    yield dump_json(coastlines)[:-1] + b',"paths":['
 
-    print(f"\nTotal: {len(all_paths)} paths, {total_curves} Bézier curves")
-    
-    return document
+    total_paths = 0
+    total_curves = 0
+    for svg_file, shift in ((inner_svg, INNER_SHIFT), (outer_svg, OUTER_SHIFT)):
+        if not svg_file:
+            continue
+        print(f"Processing {svg_file}...")
+        svg_paths = parse_svg_file(svg_file)
+        print(f"  Found {len(svg_paths)} SVG paths")
+        converted = process_svg_to_paths(svg_paths, shift)
+        curves = sum(len(p["cubicSegments"]) for p in converted)
+        print(f"  Converted to {len(converted)} segments with {curves} Bézier curves")
+        for path in converted:
+            yield (b',' if total_paths else b'') + dump_json(path)
+            total_paths += 1
+        total_curves += curves
+
+    yield b']}]}'
+
+    print(f"\nTotal: {total_paths} paths, {total_curves} Bézier curves")
 
 
 def main():
@@ -424,15 +794,23 @@ def main():
         print("No SVG files specified. Use --inner and/or --outer, or provide file paths.")
         return
 
-    document = create_globe_document(inner_svg, outer_svg, args.name, include_grid=not args.no_grid)
-
     # Default output: iCloud Drive with name-based filename
     if args.output:
         output_path = Path(args.output)
     else:
         output_path = ICLOUD_DRIVE / f"{args.name}.globe"
-    with open(output_path, 'w') as f:
-        json.dump(document, f, separators=(',', ':'))
+    # Stream into a temp file beside the target and swap it in only once
+    # the document is complete, so a failed run never leaves a truncated
+    # .globe (which iCloud would sync) in place of the previous one
+    tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb', buffering=1 << 20) as f:
+            for chunk in iter_globe_document(inner_svg, outer_svg, args.name, include_grid=not args.no_grid):
+                f.write(chunk)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
     
     file_size = output_path.stat().st_size
     if file_size > 1024 * 1024: